@@ -43,7 +43,7 @@ def sp_add(
     >>> A + A(w)
     SparseMatrix(indices=tensor([[0, 1, 2],
             [3, 0, 2]]),
-    values=tensor([21, 12, 33]),
+    values=tensor([22, 11, 33]),
     shape=(3, 4), nnz=3)
 
     Case 2: Add two sparse matrices of different sparsity structure
@@ -236,7 +236,7 @@ def sp_div(
     >>> A/A(w)
     SparseMatrix(indices=tensor([[ 0,  1,  1,  2,  7],
             [49,  0,  7,  2,  1]]),
-    values=tensor([20.0000,  5.0000, 16.6667,  7.5000,  8.0000]),
+    values=tensor([10., 10., 10., 10., 10.]),
     shape=(10, 50), nnz=5)
 
     Case 2: Elementwise multiplication between sparse matrix and scalar value
@@ -250,8 +250,10 @@ def sp_div(
     """
     B = B.as_sparse() if isinstance(B, DiagMatrix) else B
     if isinstance(A, SparseMatrix) and isinstance(B, SparseMatrix):
-        # same sparsity structure
-        if torch.equal(A.indices("COO"), B.indices("COO")):
+        # Same sparsity structure. Compare the coalesced indices so that
+        # matrices whose raw nnz entries are ordered differently still
+        # match; accessing .adj refreshes row/col/val to that order.
+        if torch.equal(A.adj.indices(), B.adj.indices()):
             return SparseMatrix(A.row, A.col, A.val / B.val, A.shape)
         raise ValueError(
             "Division between matrices of different sparsity is not supported"
@@ -298,9 +300,9 @@ def sp_power(A: SparseMatrix, B: float) -> SparseMatrix:
     >>> valA = torch.tensor([10, 20, 30, 40, 50])
     >>> A = SparseMatrix(rowA, colA, valA, shape=(10, 50))
     >>> pow(A, 2.5)
-    SparseMatrix(indices=tensor([[ 0,  1,  1,  2,  7],
-            [49,  0,  7,  2,  1]]),
-    values=tensor([ 1788.8544,   316.2278, 17677.6699,  4929.5029, 10119.2881]),
+    SparseMatrix(indices=tensor([[ 1,  0,  2,  7,  1],
+            [ 0, 49,  2,  1,  7]]),
+    values=tensor([  316.2278,  1788.8544,  4929.5029, 10119.2881, 17677.6699]),
     shape=(10, 50), nnz=5)
     """
     if isinstance(B, SparseMatrix):
@@ -32,7 +32,7 @@ def _sparse_dense_mm(A: SparseMatrix, X: torch.Tensor) -> torch.Tensor:
     if len(X.shape) == 1:
         is_one_dim = True
         X = X.view(-1, 1)
-    ret = torch.sparse.mm(A.adj, X)
+    ret = torch.sparse.mm(A.csr(), X)
     if is_one_dim:
         ret = ret.view(-1)
     return ret
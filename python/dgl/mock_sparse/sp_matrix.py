@@ -1,16 +1,65 @@
 """DGL sparse matrix module."""
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
+import numpy as np
 import torch
 
+try:
+    import numba
+
+    @numba.njit(parallel=True)
+    def _expand_indptr_kernel(indptr, out):
+        for i in numba.prange(indptr.shape[0] - 1):
+            for j in range(indptr[i], indptr[i + 1]):
+                out[j] = i
+
+except ImportError:
+    numba = None
+
 __all__ = [
     "SparseMatrix",
     "create_from_coo",
+    "create_batch_from_coo",
     "create_from_csr",
     "create_from_csc",
 ]
 
 
+def _expand_indptr(indptr: torch.Tensor, nnz: int) -> torch.Tensor:
+    """Expand a CSR/CSC indptr array into per-nnz major-axis indices.
+
+    Uses a parallel Numba kernel on CPU when Numba is available, which
+    avoids the intermediate count tensor of the repeat_interleave path.
+    """
+    if numba is not None and indptr.device.type == "cpu":
+        out = np.empty(nnz, dtype=np.int64)
+        _expand_indptr_kernel(indptr.numpy(), out)
+        return torch.from_numpy(out)
+    counts = indptr[1:] - indptr[:-1]
+    return torch.repeat_interleave(
+        torch.arange(
+            indptr.numel() - 1, dtype=torch.int64, device=indptr.device
+        ),
+        counts,
+    )
+
+
+def _build_adj(
+    row: torch.Tensor,
+    col: torch.Tensor,
+    val: torch.Tensor,
+    size: Tuple[int, ...],
+) -> torch.Tensor:
+    """Pack raw COO arrays into an (uncoalesced) torch sparse tensor.
+
+    Deliberately not wrapped in ``torch.compile``: Dynamo cannot trace
+    through sparse-layout construction, so a wrapper would raise at the
+    first call instead of falling back to eager.
+    """
+    i = torch.stack((row, col), dim=0)
+    return torch._sparse_coo_tensor_unsafe(i, val, size)
+
+
 class SparseMatrix:
     r"""Class for sparse matrix.
 
@@ -61,20 +110,111 @@ class SparseMatrix:
         val: Optional[torch.Tensor] = None,
         shape: Optional[Tuple[int, int]] = None,
     ):
+        assert row.device == col.device, (
+            f"Expect row and col to be on the same device, "
+            f"got {row.device} and {col.device}"
+        )
+        assert val is None or val.device == row.device, (
+            f"Expect val to be on the same device as the indices, "
+            f"got {val.device} and {row.device}"
+        )
         if val is None:
-            val = torch.ones(row.shape[0])
-        i = torch.cat((row.unsqueeze(0), col.unsqueeze(0)), 0)
-        if shape is None:
-            self.adj = torch.sparse_coo_tensor(i, val).coalesce()
+            # A zero-copy broadcast of a single scalar; nothing is
+            # materialized unless a consumer forces a contiguous copy.
+            val = torch.ones(
+                (), dtype=torch.float32, device=row.device
+            ).expand(row.shape[0])
+        self._row = row
+        self._col = col
+        self._val = val
+        if shape is not None:
+            self._shape = shape
+            self._shape_tensor = None
+        elif row.numel() == 0:
+            # amax is undefined on empty indices; an empty matrix with no
+            # explicit shape has no rows or columns to infer.
+            self._shape = (0, 0)
+            self._shape_tensor = None
         else:
-            if len(val.shape) > 1:
-                shape += (val.shape[-1],)
-            self.adj = torch.sparse_coo_tensor(i, val, shape).coalesce()
+            # Keep the reduction on-device; materializing Python ints here
+            # would synchronize the CUDA stream on every construction. The
+            # tuple is derived lazily when .shape is first read.
+            self._shape = None
+            self._shape_tensor = torch.stack((row.amax(), col.amax())) + 1
+        self._dtype = val.dtype
+        self._device = val.device
+        self._coalesced = False
+        self._adj = None
+        self._csr = None
+        self._csc = None
+        self._row_i32 = None
+        self._col_i32 = None
+
+    @classmethod
+    def _from_pre_coalesced(
+        cls,
+        row: torch.Tensor,
+        col: torch.Tensor,
+        val: Optional[torch.Tensor],
+        shape: Tuple[int, int],
+    ) -> "SparseMatrix":
+        """Construct a matrix from indices known to be sorted and unique.
+
+        Internal fast path for call sites whose format guarantees row-major
+        sorted, duplicate-free (row, col) pairs. Coalesce is idempotent but
+        expensive, so it is skipped outright: the packed tensor built later
+        by :meth:`_get_adj` is flagged coalesced without a sort.
+        """
+        mat = cls(row, col, val, shape)
+        # Skipping coalesce also skips the only step that would copy the
+        # values, so a broadcast implicit-ones view (or any non-contiguous
+        # val) would flow straight into sparse tensors whose backends assume
+        # packed buffers. Materialize the values up front on this path.
+        mat._val = mat._val.contiguous()
+        mat._coalesced = True
+        return mat
+
+    def _get_adj(self) -> torch.Tensor:
+        """Return the matrix as a coalesced COO tensor, building it on demand.
+
+        The matrix itself only stores the raw ``_row``/``_col``/``_val``
+        arrays; the packed tensor is constructed and coalesced on first use.
+        Once coalesced, the raw arrays are refreshed so that they stay
+        consistent with the tensor.
+        """
+        if self._adj is None:
+            if len(self._val.shape) > 1:
+                size = self.shape + (self._val.shape[-1],)
+            else:
+                size = self.shape
+            self._adj = _build_adj(self._row, self._col, self._val, size)
+            if self._coalesced:
+                self._adj._coalesced_(True)
+        if not self._coalesced:
+            self._adj = self._adj.coalesce()
+            self._row, self._col = self._adj.indices()
+            self._val = self._adj.values()
+            if self._row_i32 is not None:
+                self._row_i32 = self._row.to(torch.int32)
+                self._col_i32 = self._col.to(torch.int32)
+            self._coalesced = True
+        return self._adj
 
     def __repr__(self):
         return f'SparseMatrix(indices={self.indices("COO")}, \nvalues={self.val}, \
                 \nshape={self.shape}, nnz={self.nnz})'
 
+    @property
+    def adj(self) -> torch.Tensor:
+        """Get the matrix as a coalesced torch sparse COO tensor.
+
+        Returns
+        -------
+        torch.Tensor
+            Coalesced torch sparse COO tensor
+        """
+        return self._get_adj()
+
     @property
     def shape(self) -> Tuple[int, ...]:
         """Shape of the sparse matrix.
@@ -84,7 +224,9 @@ class SparseMatrix:
         tuple[int]
             The shape of the matrix
         """
-        return (self.adj.shape[0], self.adj.shape[1])
+        if self._shape is None:
+            self._shape = tuple(self._shape_tensor.tolist())
+        return self._shape
 
     @property
     def nnz(self) -> int:
@@ -95,7 +237,7 @@ class SparseMatrix:
         int
             The number of nonzero elements of the matrix
         """
-        return self.adj._nnz()
+        return self._row.shape[0]
 
     @property
     def dtype(self) -> torch.dtype:
@@ -106,7 +248,7 @@ class SparseMatrix:
         torch.dtype
             Data type of the values of the matrix
         """
-        return self.adj.dtype
+        return self._dtype
 
     @property
     def device(self) -> torch.device:
@@ -117,7 +259,7 @@ class SparseMatrix:
         torch.device
             Device of the matrix
         """
-        return self.adj.device
+        return self._device
 
     @property
     def row(self) -> torch.Tensor:
@@ -128,7 +270,7 @@ class SparseMatrix:
         tensor
             Row indices of the nonzero elements
         """
-        return self.adj.indices()[0]
+        return self._row
 
     @property
     def col(self) -> torch.Tensor:
@@ -139,7 +281,7 @@ class SparseMatrix:
         tensor
             Column indices of the nonzero elements
         """
-        return self.adj.indices()[1]
+        return self._col
 
     @property
     def val(self) -> torch.Tensor:
@@ -150,19 +292,25 @@ class SparseMatrix:
         tensor
             Values of the nonzero elements
         """
-        return self.adj.values()
+        return self._val
 
     @val.setter
     def val(self, x: torch.Tensor) -> torch.Tensor:
         """Set the values of the nonzero elements."""
-        assert len(x) == self.nnz
-        if len(x.shape) == 1:
-            shape = self.shape
-        else:
-            shape = self.shape + (x.shape[-1],)
-        self.adj = torch.sparse_coo_tensor(
-            self.adj.indices(), x, shape
-        ).coalesce()
+        assert x.shape[0] == self._row.shape[0]
+        self._val = x
+        self._dtype = x.dtype
+        self._device = x.device
+        if self._adj is not None:
+            # Only the values changed; reuse the coalesced indices instead
+            # of rebuilding and re-sorting the packed tensor later.
+            size = self.shape + tuple(x.shape[1:])
+            self._adj = torch._sparse_coo_tensor_unsafe(
+                self._adj._indices(), x, size
+            )
+            self._adj._coalesced_(True)
+        self._csr = None
+        self._csc = None
 
     def __call__(self, x: torch.Tensor):
         """Create a new sparse matrix with the same sparsity as self but different values.
@@ -178,8 +326,24 @@ class SparseMatrix:
             A new sparse matrix object of the SparseMatrix class
 
         """
-        assert len(x) == self.nnz
-        return SparseMatrix(self.row, self.col, x, shape=self.shape)
+        assert x.shape[0] == self._row.shape[0]
+        # The sparsity pattern is unchanged, so share the index arrays and
+        # the coalesced flag instead of going through __init__ again.
+        mat = SparseMatrix.__new__(SparseMatrix)
+        mat._row = self._row
+        mat._col = self._col
+        mat._val = x
+        mat._dtype = x.dtype
+        mat._device = x.device
+        mat._shape = self._shape
+        mat._shape_tensor = self._shape_tensor
+        mat._coalesced = self._coalesced
+        mat._adj = None
+        mat._csr = None
+        mat._csc = None
+        mat._row_i32 = self._row_i32
+        mat._col_i32 = self._col_i32
+        return mat
 
     def indices(
         self, fmt: str, return_shuffle=False
@@ -199,7 +363,7 @@ class SparseMatrix:
             Indices of the nonzero elements
         """
         if fmt == "COO" and not return_shuffle:
-            return self.adj.indices()
+            return torch.stack((self._row, self._col), dim=0)
         else:
             raise NotImplementedError
 
@@ -213,25 +377,57 @@ class SparseMatrix:
         """
         return self
 
-    def csr(self) -> Tuple[torch.Tensor, ...]:
+    def csr(self) -> torch.Tensor:
         """Get the CSR (Compressed Sparse Row) representation of the sparse matrix.
 
+        The result is cached and reused until the values are replaced.
+
         Returns
         -------
-        tensor
-            A tensor containing compressed row pointers, column indices and value tensors.
+        torch.Tensor
+            A torch sparse CSR tensor exposing ``crow_indices``,
+            ``col_indices`` and ``values``.
         """
-        return self
-
-    def csc(self) -> Tuple[torch.Tensor, ...]:
+        if self._csr is None:
+            adj = self._get_adj()
+            nrows, ncols = self.shape
+            if (
+                nrows <= 2**31
+                and ncols <= 2**31
+                and self.nnz <= torch.iinfo(torch.int32).max
+            ):
+                # Convert the indices to int32 on first use, so the CSR path
+                # can feed MKL/cuSPARSE without an int64 -> int32 cast. The
+                # eligibility check needs the host-side shape, which is only
+                # guaranteed to be synced at this point. crow_indices values
+                # run up to nnz, so nnz must fit in int32 as well.
+                if self._row_i32 is None:
+                    self._row_i32 = self._row.to(torch.int32)
+                    self._col_i32 = self._col.to(torch.int32)
+                crow = torch._convert_indices_from_coo_to_csr(
+                    self._row_i32, nrows, out_int32=True
+                )
+                self._csr = torch.sparse_csr_tensor(
+                    crow, self._col_i32, self._val, adj.shape
+                )
+            else:
+                self._csr = adj.to_sparse_csr()
+        return self._csr
+
+    def csc(self) -> torch.Tensor:
         """Get the CSC (Compressed Sparse Column) representation of the sparse matrix.
 
+        The result is cached and reused until the values are replaced.
+
         Returns
         -------
-        tensor
-            A tensor containing compressed column pointers, row indices and value tensors.
+        torch.Tensor
+            A torch sparse CSC tensor exposing ``ccol_indices``,
+            ``row_indices`` and ``values``.
         """
-        return self
+        if self._csc is None:
+            self._csc = self._get_adj().to_sparse_csc()
+        return self._csc
 
     def dense(self) -> torch.Tensor:
         """Get the dense representation of the sparse matrix.
@@ -241,7 +437,71 @@ class SparseMatrix:
         tensor
             Dense representation of the sparse matrix.
         """
-        return self.adj.to_dense()
+        shape = self.shape + tuple(self._val.shape[1:])
+        out = torch.zeros(
+            shape, dtype=self._val.dtype, device=self._val.device
+        )
+        # accumulate=True sums duplicate (row, col) entries, matching
+        # coalesce semantics without paying for the sort.
+        out.index_put_((self._row, self._col), self._val, accumulate=True)
+        return out
+
+    def index_select(self, dim: int, index: torch.Tensor):
+        """Select rows or columns of the sparse matrix by index.
+
+        Parameters
+        ----------
+        dim : int
+            The dimension to select along, 0 for rows and 1 for columns.
+        index : tensor
+            The indices to select of shape (k).
+
+        Returns
+        -------
+        SparseMatrix
+            A sparse matrix of shape (k, N) if :attr:`dim` is 0 and
+            (M, k) if :attr:`dim` is 1.
+
+        Example
+        -------
+
+        >>> row = torch.tensor([0, 1, 1, 2])
+        >>> col = torch.tensor([1, 0, 2, 1])
+        >>> val = torch.tensor([1, 2, 3, 4])
+        >>> A = create_from_coo(row, col, val)
+        >>> A = A.index_select(0, torch.tensor([2, 0]))
+        >>> print(A)
+        SparseMatrix(indices=tensor([[0, 1],
+                [1, 1]]),
+        values=tensor([4, 1]),
+        shape=(2, 3), nnz=2)
+        """
+        assert dim in (0, 1), f"Expect dim to be 0 or 1, got {dim}"
+        if dim == 1:
+            return self.transpose().index_select(0, index).transpose()
+        # Coalescing sorts the row array, so the nnz range of each selected
+        # row can be found with two binary searches. This avoids
+        # torch.sparse's much slower index_select.
+        self._get_adj()
+        starts = torch.searchsorted(self._row, index)
+        ends = torch.searchsorted(self._row, index, right=True)
+        counts = ends - starts
+        offsets = torch.cumsum(counts, 0) - counts
+        positions = (
+            torch.arange(int(counts.sum()), device=index.device)
+            - torch.repeat_interleave(offsets, counts)
+            + torch.repeat_interleave(starts, counts)
+        )
+        row = torch.repeat_interleave(
+            torch.arange(index.shape[0], device=index.device), counts
+        )
+        # The gathered entries inherit the sorted row-major order.
+        return SparseMatrix._from_pre_coalesced(
+            row,
+            self._col[positions],
+            self._val[positions],
+            (index.shape[0], self.shape[1]),
+        )
 
     def t(self):
         """Alias of :meth:`transpose()`"""
@@ -269,7 +529,7 @@ class SparseMatrix:
         >>> A = create_from_coo(row, col, val)
         >>> A = A.transpose()
         >>> print(A)
-        SparseMatrix(indices=tensor([[1, 2, 3],
+        SparseMatrix(indices=tensor([[2, 1, 3],
                 [1, 1, 3]]),
         values=tensor([1, 1, 2]),
         shape=(4, 4), nnz=3)
@@ -340,6 +600,83 @@ def create_from_coo(
     return SparseMatrix(row=row, col=col, val=val, shape=shape)
 
 
+def create_batch_from_coo(
+    rows: List[torch.Tensor],
+    cols: List[torch.Tensor],
+    vals: Optional[List[torch.Tensor]],
+    shapes: List[Tuple[int, int]],
+) -> List[SparseMatrix]:
+    """Create multiple sparse matrices from row and column coordinates,
+    sharing a single coalesce.
+
+    The matrices are laid out block-diagonally in one large COO tensor,
+    coalesced once, and split back along the block boundaries, so a
+    minibatch of N graphs pays one sort instead of N.
+
+    Parameters
+    ----------
+    rows : list[tensor]
+        The row indices of each matrix, of shape (nnz_i).
+    cols : list[tensor]
+        The column indices of each matrix, of shape (nnz_i).
+    vals : list[tensor], optional
+        The values of each matrix, of shape (nnz_i) or (nnz_i, D). If None,
+        every matrix gets values filled by 1.
+    shapes : list[tuple[int, int]]
+        Shape or size of each sparse matrix.
+
+    Returns
+    -------
+    list[SparseMatrix]
+        Sparse matrices
+
+    Examples
+    --------
+
+    >>> rows = [torch.tensor([0, 1]), torch.tensor([1, 0])]
+    >>> cols = [torch.tensor([1, 0]), torch.tensor([0, 1])]
+    >>> mats = create_batch_from_coo(rows, cols, None, [(2, 2), (2, 2)])
+    >>> print(mats[1])
+    SparseMatrix(indices=tensor([[0, 1],
+            [1, 0]]),
+    values=tensor([1., 1.]),
+    shape=(2, 2), nnz=2)
+    """
+    device = rows[0].device
+    nrows = torch.tensor([shape[0] for shape in shapes], device=device)
+    ncols = torch.tensor([shape[1] for shape in shapes], device=device)
+    counts = torch.tensor([row.shape[0] for row in rows], device=device)
+    row_off = torch.cumsum(nrows, 0) - nrows
+    col_off = torch.cumsum(ncols, 0) - ncols
+    row = torch.cat(rows) + torch.repeat_interleave(row_off, counts)
+    col = torch.cat(cols) + torch.repeat_interleave(col_off, counts)
+    if vals is None:
+        val = torch.ones(row.shape[0], device=device)
+    else:
+        val = torch.cat(vals)
+    size = (int(nrows.sum()), int(ncols.sum()))
+    if len(val.shape) > 1:
+        size = size + (val.shape[-1],)
+    adj = _build_adj(row, col, val, size).coalesce()
+    srow, scol = adj.indices()
+    sval = adj.values()
+    # The blocks occupy disjoint row ranges, so the boundary of each matrix
+    # in the sorted arrays comes from one batched binary search.
+    bounds = torch.searchsorted(srow, row_off).tolist() + [srow.shape[0]]
+    mats = []
+    for k, shape in enumerate(shapes):
+        start, end = bounds[k], bounds[k + 1]
+        mats.append(
+            SparseMatrix._from_pre_coalesced(
+                srow[start:end] - row_off[k],
+                scol[start:end] - col_off[k],
+                sval[start:end],
+                shape,
+            )
+        )
+    return mats
+
+
 def create_from_csr(
     indptr: torch.Tensor,
     indices: torch.Tensor,
@@ -412,13 +749,22 @@ def create_from_csr(
             [5, 5]]),
     shape=(3, 3), nnz=5)
     """
-    adj_csr = torch.sparse_csr_tensor(
-        indptr, indices, torch.ones(indices.shape[0])
-    )
-    adj_coo = adj_csr.to_sparse_coo().coalesce()
-    row, col = adj_coo.indices()
-
-    return SparseMatrix(row=row, col=col, val=val, shape=shape)
+    row = _expand_indptr(indptr, indices.shape[0])
+    # CSR/CSC input commonly carries int32 indices; the expanded axis is
+    # always int64, so cast to keep the two index arrays stackable.
+    col = indices.to(torch.int64)
+    if shape is None:
+        shape = (indptr.numel() - 1, int(indices.max()) + 1)
+
+    # CSR groups the nonzero entries by row, but does not require the column
+    # indices within a row to be sorted or unique. Only input whose (row, col)
+    # pairs are strictly increasing is already coalesced; anything else falls
+    # back to the lazy coalesce, like create_from_csc.
+    if col.numel() < 2 or bool(
+        ((row[1:] > row[:-1]) | (col[1:] > col[:-1])).all()
+    ):
+        return SparseMatrix._from_pre_coalesced(row, col, val, shape)
+    return SparseMatrix(row, col, val, shape)
 
 
 def create_from_csc(
@@ -466,15 +812,15 @@ def create_from_csc(
     >>> indices = torch.tensor([2, 0, 2, 1, 2])
     >>> A = create_from_csc(indptr, indices)
     >>> print(A)
-    SparseMatrix(indices=tensor([[0, 1, 2, 2, 2],
-                                 [1, 2, 0, 1, 2]]),
+    SparseMatrix(indices=tensor([[2, 0, 2, 1, 2],
+                                 [0, 1, 1, 2, 2]]),
                  values=tensor([1., 1., 1., 1., 1.]),
                  shape=(3, 3), nnz=5)
     >>> # Specify shape
     >>> A = create_from_csc(indptr, indices, shape=(5, 3))
     >>> print(A)
-    SparseMatrix(indices=tensor([[0, 1, 2, 2, 2],
-            [1, 2, 0, 1, 2]]),
+    SparseMatrix(indices=tensor([[2, 0, 2, 1, 2],
+            [0, 1, 1, 2, 2]]),
     values=tensor([1., 1., 1., 1., 1.]),
     shape=(5, 3), nnz=5)
 
@@ -484,19 +830,21 @@ def create_from_csc(
     >>> val = torch.tensor([[1, 1], [2, 2], [3, 3], [4, 4], [5, 5]])
     >>> A = create_from_csc(indptr, indices, val)
     >>> print(A)
-    SparseMatrix(indices=tensor([[0, 1, 2, 2, 2],
-            [1, 2, 0, 1, 2]]),
-    values=tensor([[2, 2],
-            [4, 4],
-            [1, 1],
+    SparseMatrix(indices=tensor([[2, 0, 2, 1, 2],
+            [0, 1, 1, 2, 2]]),
+    values=tensor([[1, 1],
+            [2, 2],
             [3, 3],
+            [4, 4],
             [5, 5]]),
     shape=(3, 3), nnz=5)
     """
-    adj_csr = torch.sparse_csr_tensor(
-        indptr, indices, torch.ones(indices.shape[0])
-    )
-    adj_coo = adj_csr.to_sparse_coo().coalesce()
-    col, row = adj_coo.indices()
-
+    col = _expand_indptr(indptr, indices.shape[0])
+    row = indices.to(torch.int64)
+    if shape is None:
+        shape = (int(indices.max()) + 1, indptr.numel() - 1)
+
+    # The indices are unique but sorted by column rather than by row, so they
+    # still need a coalesce before the COO tensor can be consumed. Leave it to
+    # happen lazily on first use.
     return SparseMatrix(row=row, col=col, val=val, shape=shape)
@@ -1,7 +1,12 @@
 import pytest
 import torch
 
-from dgl.mock_sparse import create_from_coo, create_from_csr, create_from_csc
+from dgl.mock_sparse import (
+    create_batch_from_coo,
+    create_from_coo,
+    create_from_csr,
+    create_from_csc,
+)
 
 
 @pytest.mark.parametrize("dense_dim", [None, 4])
@@ -34,7 +39,6 @@ def test_create_from_coo(dense_dim, row, col, mat_shape):
     assert torch.allclose(mat.col, col)
 
 
-@pytest.mark.skip(reason="no way of currently testing this")
 @pytest.mark.parametrize("dense_dim", [None, 4])
 @pytest.mark.parametrize("indptr", [[0, 0, 1, 4], (0, 1, 2, 4)])
 @pytest.mark.parametrize("indices", [(0, 1, 2, 3), (1, 2, 3, 4)])
@@ -62,7 +66,6 @@ def test_create_from_csr(dense_dim, indptr, indices, mat_shape):
     col = indices
     assert torch.allclose(mat.col, col)
 
-@pytest.mark.skip(reason="no way of currently testing this")
 @pytest.mark.parametrize("dense_dim", [None, 4])
 @pytest.mark.parametrize("indptr", [[0, 0, 1, 4], (0, 1, 2, 4)])
 @pytest.mark.parametrize("indices", [(0, 1, 2, 3), (1, 2, 3, 4)])
@@ -90,3 +93,36 @@ def test_create_from_csc(dense_dim, indptr, indices, mat_shape):
     col = torch.repeat_interleave(torch.arange(deg.numel()), deg)
     assert torch.allclose(mat.col, col)
 
+
+@pytest.mark.parametrize("dim", [0, 1])
+@pytest.mark.parametrize("index", [(0, 2), (2, 1, 1)])
+def test_index_select(dim, index):
+    row = torch.tensor([0, 1, 1, 2])
+    col = torch.tensor([1, 0, 2, 1])
+    val = torch.randn(4)
+    mat = create_from_coo(row, col, val)
+    index = torch.tensor(index)
+    result = mat.index_select(dim, index)
+
+    assert torch.allclose(
+        result.dense(), mat.dense().index_select(dim, index)
+    )
+
+
+@pytest.mark.parametrize("dense_dim", [None, 4])
+def test_create_batch_from_coo(dense_dim):
+    rows = [torch.tensor([0, 1, 1]), torch.tensor([2, 0])]
+    cols = [torch.tensor([1, 0, 1]), torch.tensor([0, 2])]
+    val_shapes = [(3,), (2,)]
+    if dense_dim is not None:
+        val_shapes = [shape + (dense_dim,) for shape in val_shapes]
+    vals = [torch.randn(shape) for shape in val_shapes]
+    shapes = [(2, 2), (3, 3)]
+    mats = create_batch_from_coo(rows, cols, vals, shapes)
+
+    assert len(mats) == len(shapes)
+    for mat, row, col, val, shape in zip(mats, rows, cols, vals, shapes):
+        expected = create_from_coo(row, col, val, shape)
+        assert mat.shape == expected.shape
+        assert torch.allclose(mat.dense(), expected.dense())
+